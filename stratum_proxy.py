@@ -4,8 +4,11 @@ Proxy Stratum → FPGA
 - MODO TESTE : difficulty forçada + share inicial (dashboard)
 - MODO REAL  : difficulty real da pool
 - Hashrate LOCAL exibido em tempo real
+- MODO SERVIDOR: agrega vários proxies/placas downstream numa única conexão com a pool
+- Tracing por estágio (Chrome trace / Perfetto), ligado/desligado via SIGUSR1
 """
 
+import asyncio
 import socket
 import json
 import serial
@@ -14,6 +17,11 @@ import struct
 import binascii
 import hashlib
 import sys
+import os
+import signal
+import atexit
+import threading
+from collections import deque
 
 # =========================================================
 # CONFIGURAÇÃO
@@ -30,6 +38,24 @@ UART_BAUD = 115200
 # Difficulty extremamente fácil (modo TESTE)
 TEST_TARGET_BITS = 0x207fffff
 
+# Servidor Stratum (MODO SERVIDOR)
+# Cada downstream recebe um prefixo fixo do extranonce2 da pool:
+#   extranonce1 downstream = extranonce1 pool + prefixo
+#   extranonce2_size downstream = extranonce2_size pool - SERVER_EXTRANONCE_PREFIX_SIZE
+SERVER_HOST = "0.0.0.0"
+SERVER_PORT = 3334
+SERVER_EXTRANONCE_PREFIX_SIZE = 2      # bytes → até 65536 downstreams
+SERVER_MAX_CLIENT_BUFFER = 256 * 1024  # bytes pendentes antes de derrubar um downstream lento
+SERVER_RECONNECT_DELAY = 5             # segundos entre tentativas de reconexão com a pool
+
+# Tracing (latência por estágio do caminho notify → submit)
+# - STRATUM_TRACE=1 liga o tracing já na inicialização
+# - `kill -USR1 <pid>` liga/desliga em tempo de execução
+TRACE_ENABLED = os.environ.get("STRATUM_TRACE", "0") == "1"
+TRACE_FILE = os.environ.get("STRATUM_TRACE_FILE", "stratum_trace.json")
+TRACE_SUMMARY_INTERVAL = 60      # segundos entre resumos de latência
+TRACE_MAX_EVENTS = 200000        # eventos mantidos em memória (buffer circular)
+
 # =========================================================
 # SELEÇÃO DE MODO
 # =========================================================
@@ -38,16 +64,23 @@ print("""
 Selecione o modo:
   1 - MODO TESTE (difficulty baixa / dashboard)
   2 - MODO REAL  (difficulty da pool)
+  3 - MODO SERVIDOR (agrega downstreams numa conexão com a pool)
 """)
 
 mode = input(">>> ").strip()
 
+MODE_SERVER = False
+
 if mode == "1":
     MODE_TEST = True
     print("\n Iniciando em MODO TESTE\n")
 elif mode == "2":
     MODE_TEST = False
     print("\n Iniciando em MODO REAL\n")
+elif mode == "3":
+    MODE_TEST = False
+    MODE_SERVER = True
+    print("\n Iniciando em MODO SERVIDOR\n")
 else:
     print("Modo inválido.")
     sys.exit(1)
@@ -85,6 +118,12 @@ def build_header(version, prevhash, merkle_root, ntime, nbits, nonce):
         struct.pack("<I", nonce)
     )
 
+def is_hex(value, length):
+    return (
+        isinstance(value, str) and len(value) == length
+        and all(c in "0123456789abcdefABCDEF" for c in value)
+    )
+
 def format_hashrate(h):
     if h < 1e3:
         return f"{h:.2f} H/s"
@@ -95,6 +134,154 @@ def format_hashrate(h):
     else:
         return f"{h/1e9:.2f} GH/s"
 
+# =========================================================
+# TRACING
+# =========================================================
+
+class _NullSpan:
+    """Span vazio usado quando o tracing está desligado (custo ~zero)."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "t0")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.t0, time.perf_counter_ns(), self.args)
+        return False
+
+
+class Tracer:
+    """
+    Instrumentação por estágio do proxy.
+
+    - span(nome, **args): context manager que mede um estágio
+    - export(): grava Chrome trace JSON (abre em chrome://tracing ou ui.perfetto.dev)
+    - maybe_report(): imprime resumo periódico de latência por estágio e
+      aplica liga/desliga pedido via SIGUSR1
+    """
+
+    def __init__(self, enabled, path, summary_interval, max_events):
+        self.enabled = enabled
+        self.path = path
+        self.summary_interval = summary_interval
+        self.events = deque(maxlen=max_events)
+        self.stats = {}
+        self.pid = os.getpid()
+        self.t_origin = time.perf_counter_ns()
+        self.last_report = time.time()
+        self.toggle_pending = False
+        self.exports = 0
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def record(self, name, t0, t1, args=None):
+        dur = t1 - t0
+        self.events.append((name, t0, dur, threading.get_ident(), args))
+        st = self.stats.get(name)
+        if st is None:
+            # [contagem, soma, máximo] em ns
+            self.stats[name] = [1, dur, dur]
+        else:
+            st[0] += 1
+            st[1] += dur
+            if dur > st[2]:
+                st[2] = dur
+
+    def toggle(self, *_):
+        # handler de sinal: sem I/O aqui (print/arquivo podem ser reentrantes);
+        # o resumo e o export ficam para o próximo maybe_report()
+        self.enabled = not self.enabled
+        self.toggle_pending = True
+
+    def maybe_report(self):
+        if self.toggle_pending:
+            self.toggle_pending = False
+            print(f"\n Tracing {'LIGADO' if self.enabled else 'DESLIGADO'}")
+            if not self.enabled:
+                self.report()
+                self.export()
+        if not self.enabled:
+            return
+        now = time.time()
+        if now - self.last_report >= self.summary_interval:
+            self.last_report = now
+            self.report()
+
+    def report(self):
+        stats = sorted(self.stats.items(), key=lambda kv: kv[1][1], reverse=True)
+        self.stats = {}
+        if not stats:
+            return
+        print("\n Latência por estágio (ordenado por tempo total):")
+        print(f"   {'estágio':<28}{'n':>7}{'média ms':>12}{'máx ms':>12}{'total ms':>12}")
+        for name, (n, total, mx) in stats:
+            print(
+                f"   {name:<28}{n:>7}{total / n / 1e6:>12.3f}"
+                f"{mx / 1e6:>12.3f}{total / 1e6:>12.3f}"
+            )
+
+    def export_path(self):
+        # cada sessão (liga → desliga) vai para um arquivo próprio:
+        # stratum_trace.json, stratum_trace.1.json, ...
+        if self.exports == 0:
+            return self.path
+        root, ext = os.path.splitext(self.path)
+        return f"{root}.{self.exports}{ext}"
+
+    def export(self):
+        events = list(self.events)
+        if not events:
+            # nada novo desde o último export (ex.: atexit após desligar)
+            return
+        trace = []
+        for name, t0, dur, tid, args in events:
+            ev = {
+                "name": name,
+                "ph": "X",
+                "ts": (t0 - self.t_origin) / 1e3,
+                "dur": dur / 1e3,
+                "pid": self.pid,
+                "tid": tid,
+            }
+            if args:
+                ev["args"] = args
+            trace.append(ev)
+        path = self.export_path()
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        self.events.clear()
+        self.exports += 1
+        print(f" Trace salvo em {path} ({len(trace)} eventos)")
+
+
+tracer = Tracer(TRACE_ENABLED, TRACE_FILE, TRACE_SUMMARY_INTERVAL, TRACE_MAX_EVENTS)
+atexit.register(tracer.export)
+if hasattr(signal, "SIGUSR1"):
+    signal.signal(signal.SIGUSR1, tracer.toggle)
+
 # =========================================================
 # FPGA
 # =========================================================
@@ -110,20 +297,21 @@ class FPGAManager:
             self.uart.read(self.uart.in_waiting)
 
     def send_command(self, cmd, clear=True):
-        if clear:
-            self.clear_buffer()
-
-        self.uart.write((cmd + "\n").encode())
-        time.sleep(0.05)
-
-        resp = b""
-        start = time.time()
-        while time.time() - start < 2:
-            if self.uart.in_waiting:
-                resp += self.uart.read(self.uart.in_waiting)
-                if b"RUNTIME>" in resp:
-                    break
-            time.sleep(0.01)
+        with tracer.span("fpga.cmd." + cmd.split(" ", 1)[0]):
+            if clear:
+                self.clear_buffer()
+
+            self.uart.write((cmd + "\n").encode())
+            time.sleep(0.05)
+
+            resp = b""
+            start = time.time()
+            while time.time() - start < 2:
+                if self.uart.in_waiting:
+                    resp += self.uart.read(self.uart.in_waiting)
+                    if b"RUNTIME>" in resp:
+                        break
+                time.sleep(0.01)
 
         return "\n".join(
             l.strip() for l in resp.decode(errors="ignore").splitlines()
@@ -140,9 +328,11 @@ class FPGAManager:
 
         target_hex = "".join(struct.pack("<I", w).hex() for w in words)
 
-        self.send_command("miner_clear")
-        time.sleep(0.1)
-        self.send_command(f"miner_job {header_hex}{target_hex}")
+        with tracer.span("fpga.send_job"):
+            self.send_command("miner_clear")
+            time.sleep(0.1)
+            # retorna quando o firmware devolve o prompt (job reconhecido)
+            self.send_command(f"miner_job {header_hex}{target_hex}")
         print("    Job enviado ao FPGA")
 
     def wait_for_nonce(self, timeout=30):
@@ -169,6 +359,7 @@ class FPGAManager:
             )
 
             resp = self.send_command("miner_status", clear=False)
+            tracer.maybe_report()
             if resp:
                 for line in resp.splitlines():
                     if "Nonce encontrado" in line and "(" in line:
@@ -203,6 +394,333 @@ def connect_pool():
 
     return sock
 
+# =========================================================
+# SERVIDOR STRATUM
+# =========================================================
+
+class Downstream:
+    """Conexão de um proxy/placa downstream com seu slice de extranonce2."""
+
+    def __init__(self, reader, writer, prefix):
+        self.reader = reader
+        self.writer = writer
+        self.prefix = prefix
+        self.prefix_hex = ""
+        self.subscribed = False
+        self.peer = writer.get_extra_info("peername")
+
+    def send(self, data):
+        if self.writer.is_closing():
+            return
+        # downstream que não consome as mensagens não pode crescer o buffer sem limite
+        if self.writer.transport.get_write_buffer_size() > SERVER_MAX_CLIENT_BUFFER:
+            print(f" Downstream {self.peer} lento, desconectando")
+            self.writer.close()
+            return
+        self.writer.write(data)
+
+    def reply(self, msg_id, result, error=None):
+        self.send((json.dumps({
+            "id": msg_id,
+            "result": result,
+            "error": error
+        }) + "\n").encode())
+
+
+class ServerConfigError(Exception):
+    """Configuração do servidor incompatível com a pool (não adianta reconectar)."""
+
+
+class StratumServer:
+    """
+    Servidor Stratum assíncrono.
+
+    - Mantém UMA conexão com a pool (subscribe/authorize com POOL_USER)
+    - Cada downstream recebe um prefixo único do extranonce2 da pool
+    - mining.notify / mining.set_difficulty são serializados uma vez e
+      repassados a todos os downstreams
+    - mining.submit dos downstreams é reescrito (usuário, extranonce2, id)
+      e enviado pela conexão única; a resposta volta ao downstream de origem
+    """
+
+    def __init__(self, host, port, prefix_size):
+        self.host = host
+        self.port = port
+        self.prefix_size = prefix_size
+
+        self.clients = {}            # prefixo -> Downstream
+        self.free_prefixes = deque()
+        self.next_prefix = 0
+
+        self.upstream = None
+        self.extranonce1 = None
+        self.extranonce2_size = 0
+        self.ready = asyncio.Event()
+
+        self.last_difficulty = None  # linha serializada
+        self.last_notify = None      # linha serializada
+        self.pending = {}            # id upstream -> (Downstream, id downstream)
+        self.next_id = 3             # 1 e 2 = subscribe/authorize
+
+        self.shares_sent = 0
+        self.shares_accepted = 0
+
+    # ---------------- prefixos de extranonce2 ----------------
+
+    def alloc_prefix(self):
+        # prefixos nunca usados primeiro: um downstream que reconecta não pode
+        # receber o mesmo extranonce1 (reiniciaria seus extranonce2 já usados)
+        if self.next_prefix < 256 ** self.prefix_size:
+            prefix = self.next_prefix
+            self.next_prefix += 1
+            return prefix
+        if self.free_prefixes:
+            return self.free_prefixes.popleft()
+        return None
+
+    def release_prefix(self, prefix):
+        if self.clients.pop(prefix, None) is not None:
+            self.free_prefixes.append(prefix)
+
+    # ---------------- upstream (pool) ----------------
+
+    async def connect_upstream(self):
+        reader, writer = await asyncio.open_connection(POOL_HOST, POOL_PORT)
+        self.upstream = writer
+        writer.write(json.dumps({
+            "id": 1,
+            "method": "mining.subscribe",
+            "params": ["fpga-proxy/1.0"]
+        }).encode() + b"\n")
+        writer.write(json.dumps({
+            "id": 2,
+            "method": "mining.authorize",
+            "params": [POOL_USER, POOL_PASS]
+        }).encode() + b"\n")
+        await writer.drain()
+        return reader
+
+    async def upstream_loop(self):
+        while True:
+            try:
+                reader = await self.connect_upstream()
+                print(f" Conectado à pool {POOL_HOST}:{POOL_PORT}")
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    if line.strip():
+                        self.handle_upstream(line)
+            except (OSError, ValueError) as e:
+                print(f" Erro na conexão com a pool: {e}")
+            finally:
+                if self.upstream is not None:
+                    self.upstream.close()
+                    try:
+                        await self.upstream.wait_closed()
+                    except OSError:
+                        pass
+                    self.upstream = None
+
+            # extranonce1 muda na reconexão: os downstreams precisam se reinscrever
+            print(" Pool desconectada, derrubando downstreams")
+            self.ready.clear()
+            self.pending.clear()
+            self.last_notify = None
+            for client in list(self.clients.values()):
+                client.writer.close()
+            await asyncio.sleep(SERVER_RECONNECT_DELAY)
+
+    def handle_upstream(self, line):
+        try:
+            with tracer.span("stratum.json_parse"):
+                msg = json.loads(line)
+            self.dispatch_upstream(line, msg)
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            # uma linha inválida da pool não derruba o servidor
+            print(f" Mensagem inválida da pool ignorada: {e!r}")
+
+    def dispatch_upstream(self, line, msg):
+        method = msg.get("method")
+        msg_id = msg.get("id")
+
+        if msg_id == 1 and method is None:
+            result = msg.get("result")
+            if not isinstance(result, list) or len(result) < 3:
+                raise ConnectionError(f"subscribe recusado pela pool: {msg.get('error')}")
+            self.extranonce1 = result[1]
+            self.extranonce2_size = result[2]
+            if self.extranonce2_size <= self.prefix_size:
+                raise ServerConfigError(
+                    f"extranonce2_size da pool ({self.extranonce2_size}) não comporta "
+                    f"prefixo de {self.prefix_size} bytes "
+                    f"(reduza SERVER_EXTRANONCE_PREFIX_SIZE)"
+                )
+            print(
+                f" Subscribed extranonce1={self.extranonce1} "
+                f"extranonce2_size={self.extranonce2_size}"
+            )
+            self.ready.set()
+
+        elif msg_id == 2 and method is None:
+            print(f" Authorize: {msg.get('result')}")
+
+        elif method == "mining.notify":
+            # linha recebida é repassada sem re-serializar
+            self.last_notify = line
+            with tracer.span("server.fanout", clients=len(self.clients)):
+                self.broadcast(line)
+
+        elif method == "mining.set_difficulty":
+            self.last_difficulty = line
+            self.broadcast(line)
+
+        elif msg_id in self.pending:
+            client, client_id = self.pending.pop(msg_id)
+            if msg.get("result"):
+                self.shares_accepted += 1
+            msg["id"] = client_id
+            client.send((json.dumps(msg) + "\n").encode())
+
+    def broadcast(self, line):
+        for client in self.clients.values():
+            if client.subscribed:
+                client.send(line)
+
+    # ---------------- downstream ----------------
+
+    async def handle_client(self, reader, writer):
+        prefix = self.alloc_prefix()
+        if prefix is None:
+            print(" Sem prefixos de extranonce2 livres, recusando downstream")
+            writer.close()
+            return
+
+        client = Downstream(reader, writer, prefix)
+        self.clients[prefix] = client
+        print(f" Downstream conectado {client.peer} (total {len(self.clients)})")
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                msg = json.loads(line)
+                await self.handle_client_msg(client, msg)
+                await writer.drain()
+        except (OSError, ValueError, TypeError, KeyError, IndexError, AttributeError):
+            # ValueError: JSON inválido ou linha acima do limite do StreamReader;
+            # demais: mensagem malformada não prevista — derruba só este downstream
+            pass
+        finally:
+            self.release_prefix(prefix)
+            writer.close()
+            print(f" Downstream desconectado {client.peer} (total {len(self.clients)})")
+
+    async def handle_client_msg(self, client, msg):
+        if not isinstance(msg, dict):
+            client.reply(None, None, [20, "Mensagem inválida", None])
+            return
+
+        method = msg.get("method")
+        msg_id = msg.get("id")
+
+        if method == "mining.subscribe":
+            await self.ready.wait()
+            client.prefix_hex = f"{client.prefix:0{self.prefix_size * 2}x}"
+            client.reply(msg_id, [
+                [["mining.set_difficulty", client.prefix_hex],
+                 ["mining.notify", client.prefix_hex]],
+                self.extranonce1 + client.prefix_hex,
+                self.extranonce2_size - self.prefix_size
+            ])
+            client.subscribed = True
+            if self.last_difficulty:
+                client.send(self.last_difficulty)
+            if self.last_notify:
+                client.send(self.last_notify)
+
+        elif method == "mining.authorize":
+            # a pool só conhece POOL_USER; downstreams são aceitos localmente
+            client.reply(msg_id, True)
+
+        elif method == "mining.submit":
+            self.submit(client, msg_id, msg.get("params", []))
+
+        else:
+            client.reply(msg_id, None, [20, f"Método não suportado: {method}", None])
+
+    def submit(self, client, msg_id, params):
+        with tracer.span("server.submit"):
+            if not client.subscribed:
+                client.reply(msg_id, None, [25, "Não inscrito", None])
+                return
+            if (not isinstance(params, list) or len(params) < 5
+                    or not all(isinstance(p, str) for p in params)):
+                client.reply(msg_id, None, [20, "Parâmetros inválidos", None])
+                return
+            if self.upstream is None:
+                client.reply(msg_id, None, [20, "Pool desconectada", None])
+                return
+
+            _, job_id, extranonce2, ntime, nonce = params[:5]
+            if not is_hex(extranonce2, (self.extranonce2_size - self.prefix_size) * 2):
+                client.reply(msg_id, None, [20, "extranonce2 inválido", None])
+                return
+            if not is_hex(ntime, 8) or not is_hex(nonce, 8):
+                client.reply(msg_id, None, [20, "ntime/nonce inválido", None])
+                return
+
+            upstream_id = self.next_id
+            self.next_id += 1
+            self.pending[upstream_id] = (client, msg_id)
+
+            submit = {
+                "id": upstream_id,
+                "method": "mining.submit",
+                "params": [
+                    POOL_USER,
+                    job_id,
+                    client.prefix_hex + extranonce2,
+                    ntime,
+                    nonce,
+                    *params[5:]
+                ]
+            }
+            with tracer.span("stratum.send"):
+                self.upstream.write((json.dumps(submit) + "\n").encode())
+            self.shares_sent += 1
+
+    # ---------------- loop principal ----------------
+
+    async def report_loop(self):
+        last_stats = time.time()
+        while True:
+            # 1 s: aplica rápido o liga/desliga do tracing pedido via SIGUSR1
+            await asyncio.sleep(1)
+            now = time.time()
+            if now - last_stats >= TRACE_SUMMARY_INTERVAL:
+                last_stats = now
+                print(
+                    f" Downstreams: {len(self.clients)} | "
+                    f"Shares: {self.shares_accepted}/{self.shares_sent} aceitos"
+                )
+            tracer.maybe_report()
+
+    async def run(self):
+        server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        print(f" Servidor Stratum em {self.host}:{self.port}")
+        if tracer.enabled:
+            print(f" Tracing ligado → {tracer.path}")
+        async with server:
+            await asyncio.gather(
+                server.serve_forever(),
+                self.upstream_loop(),
+                self.report_loop()
+            )
+
 # =========================================================
 # MAIN
 # =========================================================
@@ -221,8 +739,12 @@ def main():
     global_start = time.time()
 
     print(" Proxy rodando")
+    if tracer.enabled:
+        print(f" Tracing ligado → {tracer.path}")
 
     while True:
+        tracer.maybe_report()
+
         data = sock.recv(4096)
         if not data:
             sock = connect_pool()
@@ -235,7 +757,8 @@ def main():
             if not line.strip():
                 continue
 
-            msg = json.loads(line)
+            with tracer.span("stratum.json_parse"):
+                msg = json.loads(line)
 
             if msg.get("id") == 1:
                 extranonce1 = msg["result"][1]
@@ -243,6 +766,7 @@ def main():
                 print(f" Subscribed extranonce1={extranonce1}")
 
             elif msg.get("method") == "mining.notify":
+                job_t0 = time.perf_counter_ns()
                 p = msg["params"]
                 job_id, prevhash, c1, c2, branches, version, nbits, ntime = p[:8]
 
@@ -258,12 +782,14 @@ def main():
                 extranonce_counter += 1
 
                 coinbase = c1 + extranonce1 + extranonce2 + c2
-                merkle = calculate_merkle_root(coinbase, branches)
+                with tracer.span("merkle_root", branches=len(branches)):
+                    merkle = calculate_merkle_root(coinbase, branches)
 
-                header = build_header(
-                    version, prevhash, merkle,
-                    ntime, effective_nbits, 0
-                )
+                with tracer.span("build_header"):
+                    header = build_header(
+                        version, prevhash, merkle,
+                        ntime, effective_nbits, 0
+                    )
 
                 fpga.send_job(header.hex(), effective_nbits)
 
@@ -281,14 +807,20 @@ def main():
                             "00000000"
                         ]
                     }
-                    sock.send((json.dumps(submit) + "\n").encode())
+                    with tracer.span("stratum.send"):
+                        sock.send((json.dumps(submit) + "\n").encode())
                     worker_registered = True
 
                 job_start = time.time()
-                nonce = fpga.wait_for_nonce(60)
+                with tracer.span("fpga.wait_for_nonce"):
+                    nonce = fpga.wait_for_nonce(60)
                 elapsed = time.time() - job_start
 
                 if nonce is None:
+                    if tracer.enabled:
+                        tracer.record("job", job_t0, time.perf_counter_ns(),
+                                      {"job_id": job_id, "found": False})
+                    tracer.maybe_report()
                     continue
 
                 hashes = nonce + 1
@@ -313,8 +845,24 @@ def main():
                     ]
                 }
 
-                sock.send((json.dumps(submit) + "\n").encode())
+                with tracer.span("stratum.send"):
+                    sock.send((json.dumps(submit) + "\n").encode())
+                if tracer.enabled:
+                    tracer.record("job", job_t0, time.perf_counter_ns(),
+                                  {"job_id": job_id, "found": True})
+                tracer.maybe_report()
                 print("    SHARE enviado")
 
+def main_server():
+    server = StratumServer(SERVER_HOST, SERVER_PORT, SERVER_EXTRANONCE_PREFIX_SIZE)
+    try:
+        asyncio.run(server.run())
+    except ServerConfigError as e:
+        print(f" Erro de configuração: {e}")
+        sys.exit(1)
+
 if __name__ == "__main__":
-    main()
+    if MODE_SERVER:
+        main_server()
+    else:
+        main()
@@ -0,0 +1,149 @@
+`timescale 1ns/1ps
+
+// Testbench de desempenho do bitcoin_miner (usado por tb/rtl_bench.py)
+// - ONE:    blocos do job A com target máximo (só o nonce 0), mede o custo
+//           fixo + 1 nonce; separa o overhead do start do custo por nonce
+// - A:      block0/block1/target vindos de plusargs, mede ciclos do start até found
+// - SWITCH: job A com target impossível; após SWITCH_AFTER ciclos, com o
+//           minerador ainda busy, o job B (target máximo) é carregado e start
+//           pulsado. Mede ciclos até o próximo found, ou reporta timeout se o
+//           novo job for ignorado
+// - Observa apenas as portas do bitcoin_miner, para comparar variantes do RTL
+//
+// Plusargs: +BLOCK0_A= +BLOCK1_A= +TARGET_A= +BLOCK0_B= +BLOCK1_B= (hex)
+//           +MAX_CYCLES= +SWITCH_AFTER= +SWITCH_MAX_CYCLES= (decimal, opcionais)
+// Saída:    linhas "BENCH ..." lidas pelo script Python
+
+module miner_bench_tb;
+
+    logic clk;
+    logic rst;
+    logic start;
+
+    logic [511:0] block0;
+    logic [511:0] block1_tmpl;
+    logic [255:0] target;
+
+    logic busy;
+    logic found;
+    logic [31:0]  found_nonce;
+    logic [255:0] found_hash;
+
+    logic [511:0] block0_a, block1_a, block0_b, block1_b;
+    logic [255:0] target_a;
+    int max_cycles;
+    int switch_after;
+    int switch_max_cycles;
+    int cycles;
+
+    bitcoin_miner dut (
+        .clk         (clk),
+        .rst         (rst),
+        .start       (start),
+        .block0      (block0),
+        .block1_tmpl (block1_tmpl),
+        .target      (target),
+        .busy        (busy),
+        .found       (found),
+        .found_nonce (found_nonce),
+        .found_hash  (found_hash)
+    );
+
+    // Clock 100 MHz
+    always #5 clk = ~clk;
+
+    // Chamado numa borda de descida: carrega o job, pulsa start por um ciclo
+    // e conta as bordas de subida desde a amostragem do start até found.
+    task automatic run_job(
+        input  string        name,
+        input  logic [511:0] b0,
+        input  logic [511:0] b1,
+        input  logic [255:0] tgt,
+        output int           n_cycles
+    );
+        block0      = b0;
+        block1_tmpl = b1;
+        target      = tgt;
+        start       = 1'b1;
+        @(negedge clk);
+        start    = 1'b0;
+        n_cycles = 1;
+        while (!found) begin
+            @(negedge clk);
+            n_cycles++;
+            if (n_cycles > max_cycles) begin
+                $display("BENCH job=%s timeout cycles=%0d", name, n_cycles);
+                $finish;
+            end
+        end
+    endtask
+
+    initial begin
+        clk   = 0;
+        rst   = 1;
+        start = 0;
+
+        block0      = 512'd0;
+        block1_tmpl = 512'd0;
+        target      = 256'd0;
+
+        if (!$value$plusargs("BLOCK0_A=%h", block0_a) ||
+            !$value$plusargs("BLOCK1_A=%h", block1_a) ||
+            !$value$plusargs("TARGET_A=%h", target_a) ||
+            !$value$plusargs("BLOCK0_B=%h", block0_b) ||
+            !$value$plusargs("BLOCK1_B=%h", block1_b)) begin
+            $display("BENCH error plusargs ausentes");
+            $finish;
+        end
+        if (!$value$plusargs("MAX_CYCLES=%d", max_cycles))
+            max_cycles = 10_000_000;
+        if (!$value$plusargs("SWITCH_AFTER=%d", switch_after))
+            switch_after = 1000;
+        if (!$value$plusargs("SWITCH_MAX_CYCLES=%d", switch_max_cycles))
+            switch_max_cycles = 100_000;
+
+        #20 rst = 0;
+        @(negedge clk);
+
+        // ONE: overhead do start + 1 nonce
+        run_job("ONE", block0_a, block1_a, {256{1'b1}}, cycles);
+        $display("BENCH job=ONE cycles=%0d nonce=%0d hash=%h", cycles, found_nonce, found_hash);
+
+        // A: ciclos do start até o nonce válido
+        run_job("A", block0_a, block1_a, target_a, cycles);
+        $display("BENCH job=A cycles=%0d nonce=%0d hash=%h", cycles, found_nonce, found_hash);
+
+        // SWITCH: job A sem solução possível, interrompido pelo job B
+        block0      = block0_a;
+        block1_tmpl = block1_a;
+        target      = 256'd0;
+        start       = 1'b1;
+        @(negedge clk);
+        start = 1'b0;
+        repeat (switch_after) @(negedge clk);
+        if (!busy) begin
+            $display("BENCH error minerador parado antes da troca de job");
+            $finish;
+        end
+
+        block0      = block0_b;
+        block1_tmpl = block1_b;
+        target      = {256{1'b1}};
+        start       = 1'b1;
+        @(negedge clk);
+        start  = 1'b0;
+        cycles = 1;
+        while (!found) begin
+            @(negedge clk);
+            cycles++;
+            if (cycles > switch_max_cycles) begin
+                $display("BENCH job=SWITCH timeout cycles=%0d", cycles);
+                $finish;
+            end
+        end
+        $display("BENCH job=SWITCH cycles=%0d nonce=%0d hash=%h", cycles, found_nonce, found_hash);
+
+        $finish;
+    end
+
+endmodule
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Benchmark de throughput do RTL (bitcoin_miner / sha256_double / sha256_core)
+- Compila tb/miner_bench_tb.sv com Icarus Verilog ou Verilator
+- Mede ciclos por nonce (inclinação, sem o overhead fixo do start), overhead
+  do start, ciclos do start até found e latência de troca de job no meio da busca
+- Confere nonce e hash de cada job contra uma referência em Python (hashlib)
+- Grava os resultados por variante de RTL em JSON (baseline rastreável)
+
+Uso:
+  python3 tb/rtl_bench.py                          # RTL de ./rtl, simulador detectado
+  python3 tb/rtl_bench.py --sim verilator
+  python3 tb/rtl_bench.py --rtl-dir rtl_pipeline --variant pipeline --baseline rtl
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import time
+
+# =========================================================
+# CONFIGURAÇÃO
+# =========================================================
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TB_DIR = os.path.join(ROOT, "tb")
+BUILD_DIR = os.path.join(TB_DIR, "build")
+
+BENCH_TB = os.path.join(TB_DIR, "miner_bench_tb.sv")
+BENCH_TOP = "miner_bench_tb"
+RTL_SOURCES = ["sha256_core.sv", "sha256_double.sv", "bitcoin_miner.sv"]
+
+DEFAULT_RESULTS = os.path.join(TB_DIR, "bench_results.json")
+DEFAULT_JOBS = 4
+DEFAULT_EXPECTED_NONCES = 32   # dificuldade: ~1 nonce válido a cada N
+MAX_REF_NONCES = 1 << 16       # limite da busca na referência Python
+# dificuldade máxima aceita: com N = MAX_REF_NONCES / 16 a chance de a
+# referência não achar nonce em MAX_REF_NONCES tentativas é ~e^-16
+MAX_EXPECTED_NONCES = MAX_REF_NONCES // 16
+DEFAULT_SWITCH_AFTER = 1000    # ciclos de busca antes de emitir o novo job
+DEFAULT_SWITCH_MAX_CYCLES = 100_000
+
+# Job fixo do tb/miner_tb.sv, mantido para comparar com o testbench original
+MINER_TB_BLOCK0 = int(
+    "000102030405060708090A0B0C0D0E0F101112131415161718191A1B1C1D1E1F"
+    "202122232425262728292A2B2C2D2E2F303132333435363738393A3B3C3D3E3F", 16
+)
+MINER_TB_BLOCK1 = int(
+    "404142434445464748494A4B4C4D4E4F505152535455565758595A5B5C5D5E5F"
+    "606162636465666768696A6B6C6D6E6F00000000000000000000000000000000", 16
+)
+
+MAX_TARGET = (1 << 256) - 1
+
+# =========================================================
+# REFERÊNCIA (mesma semântica do bitcoin_miner)
+# =========================================================
+
+_K = [
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+]
+
+_IV = (0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
+       0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19)
+
+def _rotr(x, n):
+    return ((x >> n) | (x << (32 - n))) & 0xffffffff
+
+def sha256_compress(state, block):
+    """Uma compressão SHA-256 (FIPS 180-4) de um bloco de 64 bytes."""
+    w = list(struct.unpack(">16I", block))
+    for t in range(16, 64):
+        s0 = _rotr(w[t-15], 7) ^ _rotr(w[t-15], 18) ^ (w[t-15] >> 3)
+        s1 = _rotr(w[t-2], 17) ^ _rotr(w[t-2], 19) ^ (w[t-2] >> 10)
+        w.append((w[t-16] + s0 + w[t-7] + s1) & 0xffffffff)
+
+    a, b, c, d, e, f, g, h = state
+    for t in range(64):
+        t1 = (h + (_rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25))
+              + ((e & f) ^ (~e & g)) + _K[t] + w[t]) & 0xffffffff
+        t2 = ((_rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22))
+              + ((a & b) ^ (a & c) ^ (b & c))) & 0xffffffff
+        h, g, f, e, d, c, b, a = g, f, e, (d + t1) & 0xffffffff, c, b, a, (t1 + t2) & 0xffffffff
+
+    return tuple((x + y) & 0xffffffff for x, y in zip(state, (a, b, c, d, e, f, g, h)))
+
+def _check_compress():
+    # A compressão "na mão" só existe porque o hardware hasheia blocos crus
+    # (o nonce sobrescreve os 32 LSB do bloco 1); ela é validada contra hashlib.
+    for msg in (b"", b"abc", bytes(range(55))):
+        padded = msg + b"\x80" + b"\x00" * (55 - len(msg)) + struct.pack(">Q", len(msg) * 8)
+        digest = struct.pack(">8I", *sha256_compress(_IV, padded))
+        if digest != hashlib.sha256(msg).digest():
+            raise RuntimeError("referência SHA-256 diverge do hashlib")
+
+def miner_hash(block0, block1_tmpl, nonce):
+    """hash2 do bitcoin_miner para um nonce, como inteiro de 256 bits."""
+    block1 = (block1_tmpl & ~0xffffffff) | nonce
+    midstate = sha256_compress(_IV, block0.to_bytes(64, "big"))
+    hash1 = struct.pack(">8I", *sha256_compress(midstate, block1.to_bytes(64, "big")))
+    # segundo SHA: mensagem de 32 bytes, igual ao block2 do sha256_double
+    return int.from_bytes(hashlib.sha256(hash1).digest(), "big")
+
+def miner_search(block0, block1_tmpl, target, max_nonces=MAX_REF_NONCES):
+    """Primeiro nonce com hash2 <= target (mesma ordem de busca do RTL)."""
+    for nonce in range(max_nonces):
+        h = miner_hash(block0, block1_tmpl, nonce)
+        if h <= target:
+            return nonce, h
+    return None, None
+
+# =========================================================
+# JOBS
+# =========================================================
+
+def _seeded_block(seed):
+    return int.from_bytes(
+        hashlib.sha256(seed + b"/0").digest() + hashlib.sha256(seed + b"/1").digest(),
+        "big"
+    )
+
+def make_jobs(n_jobs, expected_nonces):
+    """Jobs determinísticos: o do miner_tb.sv + blocos pseudo-aleatórios."""
+    target = MAX_TARGET // expected_nonces
+    blocks = [(MINER_TB_BLOCK0, MINER_TB_BLOCK1)]
+    i = 0
+    while len(blocks) < n_jobs + 1:
+        seed = f"rtl_bench/{i}".encode()
+        blocks.append((_seeded_block(seed + b"/b0"), _seeded_block(seed + b"/b1")))
+        i += 1
+
+    jobs = []
+    for k in range(n_jobs):
+        block0, block1 = blocks[k]
+        # job B: próximo bloco da lista, emitido no meio da busca do job A
+        next0, next1 = blocks[k + 1]
+        nonce, h = miner_search(block0, block1, target)
+        if nonce is None:
+            raise RuntimeError(f"job {k}: nenhum nonce em {MAX_REF_NONCES} tentativas")
+        jobs.append({
+            "block0": block0,
+            "block1": block1,
+            "target": target,
+            "nonce": nonce,
+            "hash": h,
+            "next_block0": next0,
+            "next_block1": next1,
+        })
+    return jobs
+
+# =========================================================
+# SIMULADOR
+# =========================================================
+
+def detect_simulator():
+    if shutil.which("iverilog") and shutil.which("vvp"):
+        return "iverilog"
+    if shutil.which("verilator"):
+        return "verilator"
+    return None
+
+def build(sim, rtl_dir, variant):
+    sources = [os.path.join(rtl_dir, f) for f in RTL_SOURCES] + [BENCH_TB]
+    for src in sources:
+        if not os.path.exists(src):
+            raise FileNotFoundError(src)
+
+    out_dir = os.path.join(BUILD_DIR, f"{variant}_{sim}")
+    os.makedirs(out_dir, exist_ok=True)
+
+    if sim == "iverilog":
+        exe = os.path.join(out_dir, BENCH_TOP)
+        subprocess.run(
+            ["iverilog", "-g2012", "-s", BENCH_TOP, "-o", exe] + sources,
+            check=True
+        )
+        return ["vvp", "-n", exe]
+
+    subprocess.run(
+        # sha256_core.sv não declara `timescale; sem --timescale o Verilator
+        # reclama de módulos misturando com/sem timescale (TIMESCALEMOD)
+        ["verilator", "--binary", "-j", "0", "-Wno-fatal", "--timescale", "1ns/1ps",
+         "--top-module", BENCH_TOP, "--Mdir", out_dir] + sources,
+        check=True, stdout=subprocess.DEVNULL
+    )
+    return [os.path.join(out_dir, f"V{BENCH_TOP}")]
+
+def run_job(cmd, job, max_cycles, switch_after, switch_max_cycles):
+    args = [
+        f"+BLOCK0_A={job['block0']:0128x}",
+        f"+BLOCK1_A={job['block1']:0128x}",
+        f"+TARGET_A={job['target']:064x}",
+        f"+BLOCK0_B={job['next_block0']:0128x}",
+        f"+BLOCK1_B={job['next_block1']:0128x}",
+        f"+MAX_CYCLES={max_cycles}",
+        f"+SWITCH_AFTER={switch_after}",
+        f"+SWITCH_MAX_CYCLES={switch_max_cycles}",
+    ]
+    proc = subprocess.run(cmd + args, capture_output=True, text=True, check=True)
+
+    results = {}
+    for line in proc.stdout.splitlines():
+        if not line.startswith("BENCH "):
+            continue
+        words = line.split()[1:]
+        fields = dict(kv.split("=", 1) for kv in words if "=" in kv)
+        name = fields.get("job")
+        if name is None:
+            raise RuntimeError(f"simulação falhou: {line}")
+        if "timeout" in words:
+            # só a troca de job pode legitimamente não terminar
+            if name != "SWITCH":
+                raise RuntimeError(f"job {name} excedeu {fields['cycles']} ciclos")
+            results[name] = {"cycles": int(fields["cycles"]), "timeout": True}
+            continue
+        results[name] = {
+            "cycles": int(fields["cycles"]),
+            "nonce": int(fields["nonce"]),
+            "hash": int(fields["hash"], 16),
+            "timeout": False,
+        }
+
+    if any(name not in results for name in ("ONE", "A", "SWITCH")):
+        raise RuntimeError(f"saída incompleta do simulador:\n{proc.stdout}")
+    return results["ONE"], results["A"], results["SWITCH"]
+
+def classify_switch(job, sw):
+    """
+    Resultado da troca de job no meio da busca:
+      ok         - hash do job B no nonce 0 (novo job aceito e nonce reiniciado)
+      timeout    - start ignorado enquanto busy
+      no_restart - blocos do job B, mas o nonce continuou do job A
+      stale      - found com o hash do job A (resultado antigo aceito no target novo)
+      invalid    - hash não corresponde a nenhum dos jobs
+    """
+    if sw["timeout"]:
+        return "timeout"
+    if sw["hash"] == miner_hash(job["next_block0"], job["next_block1"], sw["nonce"]):
+        return "ok" if sw["nonce"] == 0 else "no_restart"
+    if sw["hash"] == miner_hash(job["block0"], job["block1"], sw["nonce"]):
+        return "stale"
+    return "invalid"
+
+def fit_line(points):
+    """Mínimos quadrados y = a + b*x; retorna (a, b) ou (None, None)."""
+    n = len(points)
+    mx = sum(x for x, _ in points) / n
+    my = sum(y for _, y in points) / n
+    var = sum((x - mx) ** 2 for x, _ in points)
+    if var == 0:
+        return None, None
+    slope = sum((x - mx) * (y - my) for x, y in points) / var
+    return my - slope * mx, slope
+
+# =========================================================
+# RESULTADOS
+# =========================================================
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_results(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def print_comparison(summary, base, label):
+    print(f"\n Comparação com '{label}':")
+    for key, value in summary.items():
+        old = base.get(key)
+        if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+            continue
+        print(f"   {key:<24}{old:>12.1f} → {value:>12.1f}  ({(value - old) / old * 100:+.1f}%)")
+
+# =========================================================
+# MAIN
+# =========================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de throughput do RTL do minerador")
+    parser.add_argument("--sim", choices=["iverilog", "verilator"], default=None,
+                        help="simulador (padrão: detectado no PATH)")
+    parser.add_argument("--rtl-dir", default=os.path.join(ROOT, "rtl"),
+                        help="diretório com sha256_core.sv, sha256_double.sv e bitcoin_miner.sv")
+    parser.add_argument("--variant", default=None,
+                        help="nome da variante nos resultados (padrão: nome do --rtl-dir)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS)
+    parser.add_argument("--expected-nonces", type=int, default=DEFAULT_EXPECTED_NONCES,
+                        help="dificuldade dos jobs: ~1 nonce válido a cada N")
+    parser.add_argument("--max-cycles", type=int, default=10_000_000)
+    parser.add_argument("--switch-after", type=int, default=DEFAULT_SWITCH_AFTER,
+                        help="ciclos de busca do job A antes de emitir o job B")
+    parser.add_argument("--switch-max-cycles", type=int, default=DEFAULT_SWITCH_MAX_CYCLES,
+                        help="ciclos esperando o job B antes de declarar timeout")
+    parser.add_argument("--output", default=DEFAULT_RESULTS,
+                        help="arquivo JSON de resultados (uma entrada por variante)")
+    parser.add_argument("--baseline", default=None,
+                        help="variante do arquivo de resultados usada na comparação")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs deve ser >= 1")
+    if not 1 <= args.expected_nonces <= MAX_EXPECTED_NONCES:
+        parser.error(f"--expected-nonces deve estar entre 1 e {MAX_EXPECTED_NONCES}")
+    if args.max_cycles < 1 or args.switch_after < 1 or args.switch_max_cycles < 1:
+        parser.error("--max-cycles, --switch-after e --switch-max-cycles devem ser >= 1")
+
+    sim = args.sim or detect_simulator()
+    if sim is None:
+        print("Nenhum simulador encontrado (instale iverilog ou verilator).")
+        sys.exit(1)
+
+    rtl_dir = os.path.abspath(args.rtl_dir)
+    variant = args.variant or os.path.basename(rtl_dir.rstrip(os.sep))
+
+    _check_compress()
+
+    print(f" Variante {variant} | simulador {sim}")
+    print(f" Gerando {args.jobs} jobs (referência hashlib)")
+    jobs = make_jobs(args.jobs, args.expected_nonces)
+
+    cmd = build(sim, rtl_dir, variant)
+
+    runs = []
+    points = []   # (nonce, ciclos start→found) para a inclinação
+    ok = True
+    for k, job in enumerate(jobs):
+        one, a, sw = run_job(cmd, job, args.max_cycles,
+                             args.switch_after, args.switch_max_cycles)
+
+        match_one = one["nonce"] == 0 and one["hash"] == miner_hash(job["block0"], job["block1"], 0)
+        match_a = a["nonce"] == job["nonce"] and a["hash"] == job["hash"]
+        switch = classify_switch(job, sw)
+        # "invalid": o hash da troca não bate com nenhum dos jobs na referência
+        verified = match_one and match_a and switch != "invalid"
+        ok = ok and verified
+        points += [(0, one["cycles"]), (a["nonce"], a["cycles"])]
+
+        # custo por nonce deste job sem o overhead fixo: desconta a execução de 1 nonce
+        cycles_per_nonce = (a["cycles"] - one["cycles"]) / a["nonce"] if a["nonce"] else None
+        print(
+            f"   job {k}: nonce={a['nonce']:<6} start→found={a['cycles']:<8} "
+            f"ciclos/nonce={'-' if cycles_per_nonce is None else f'{cycles_per_nonce:.1f}':<8} "
+            f"troca={sw['cycles']} ({switch})  "
+            f"{'OK' if verified else 'DIVERGE da referência'}"
+        )
+        runs.append({
+            "nonce": a["nonce"],
+            "cycles_to_found": a["cycles"],
+            "cycles_one_nonce": one["cycles"],
+            "cycles_per_nonce": cycles_per_nonce,
+            "job_switch_cycles": sw["cycles"],
+            "job_switch_status": switch,
+            "verified": verified,
+        })
+
+    # ciclos(n) = ciclos do nonce 0 + n * ciclos/nonce
+    first_nonce, slope = fit_line(points)
+    switch_ok = [r["job_switch_cycles"] for r in runs if r["job_switch_status"] == "ok"]
+    switch_bad = [r["job_switch_status"] for r in runs if r["job_switch_status"] != "ok"]
+    summary = {
+        "cycles_per_nonce": slope,
+        "start_overhead_cycles": None if slope is None else first_nonce - slope,
+        "cycles_to_found_mean": sum(r["cycles_to_found"] for r in runs) / len(runs),
+        # só conta como latência quando o novo job realmente substituiu o anterior
+        "job_switch_cycles": max(switch_ok) if len(switch_ok) == len(runs) else None,
+        "job_switch_status": switch_bad[0] if switch_bad else "ok",
+    }
+
+    print("\n Resumo:")
+    for key, value in summary.items():
+        if isinstance(value, float) or isinstance(value, int):
+            print(f"   {key:<24}{value:>12.1f}")
+        else:
+            print(f"   {key:<24}{'-' if value is None else value:>12}")
+
+    results = load_results(args.output)
+    previous = results.get(variant)
+    if (previous and previous.get("simulator") != sim
+            and previous.get("summary", {}).get("cycles_per_nonce") != summary["cycles_per_nonce"]):
+        # o benchmark é ciclo a ciclo: iverilog e verilator devem concordar
+        print(
+            f" AVISO: {previous.get('simulator')} mediu cycles_per_nonce="
+            f"{previous['summary'].get('cycles_per_nonce')} para '{variant}', {sim} mediu "
+            f"{summary['cycles_per_nonce']}"
+        )
+    results[variant] = {
+        "simulator": sim,
+        "rtl_dir": os.path.relpath(rtl_dir, ROOT),
+        "git": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "expected_nonces": args.expected_nonces,
+        "switch_after": args.switch_after,
+        "verified": ok,
+        "summary": summary,
+        "jobs": runs,
+    }
+
+    if args.baseline and args.baseline in results:
+        print_comparison(summary, results[args.baseline]["summary"], args.baseline)
+    elif previous:
+        print_comparison(summary, previous["summary"], f"{variant} anterior")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n Resultados salvos em {args.output}")
+
+    if not ok:
+        print(" ERRO: RTL diverge da referência hashlib")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()